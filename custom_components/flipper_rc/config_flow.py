@@ -3,8 +3,9 @@
 import logging
 import voluptuous as vol
 import os
-import aiofiles.os
+import glob
 import asyncio
+import time
 from homeassistant.helpers.storage import Store
 from .flipper_ir import FlipperIR
 
@@ -12,6 +13,16 @@ from .const import *
 
 BY_ID_PATH = "/dev/serial/by-id"
 
+# Result of the last by-id autodetect scan: (timestamp, port or None).
+# Reopening the flow within the TTL reuses it instead of re-scanning.
+_AUTODETECT_CACHE = None
+_AUTODETECT_CACHE_TTL = 5
+
+# Cache of device info per port so retrying the flow (e.g. after fixing
+# the name) doesn't redo the serial round-trip: port -> (timestamp, info)
+_DEVICE_INFO_CACHE = {}
+_DEVICE_INFO_CACHE_TTL = 60
+
 from homeassistant import config_entries
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import (
@@ -34,17 +45,22 @@ class FlipperZeroRCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_PORT: DEFAULT_PORT_LINUX if os.name != 'nt' else DEFAULT_PORT_WINDOWS
         }
         self.auto_detected = False
+        # Connection kept open across retry attempts for the same port
+        self._device = None
 
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
-        if await aiofiles.os.path.exists(BY_ID_PATH):
-            # Check for the first serial device
-            devices = await aiofiles.os.listdir(BY_ID_PATH)
-            for device in devices:
-                if "_Flipper_" in device:
-                    self.config[CONF_PORT] = os.path.join(BY_ID_PATH, device)
-                    self.auto_detected = True
-                    break
+        global _AUTODETECT_CACHE
+        if _AUTODETECT_CACHE is not None and time.monotonic() - _AUTODETECT_CACHE[0] < _AUTODETECT_CACHE_TTL:
+            port = _AUTODETECT_CACHE[1]
+        else:
+            # Check for the first Flipper serial device (glob handles a missing by-id dir)
+            entries = await self.hass.async_add_executor_job(glob.glob, f"{BY_ID_PATH}/*_Flipper_*")
+            port = entries[0] if entries else None
+            _AUTODETECT_CACHE = (time.monotonic(), port)
+        if port is not None:
+            self.config[CONF_PORT] = port
+            self.auto_detected = True
         return await self.async_step_port()
 
     async def async_step_port(self, user_input=None):
@@ -52,20 +68,31 @@ class FlipperZeroRCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             self.config[CONF_PORT] = user_input[CONF_PORT]
-            device = None
             try:
                 unique_id = f"{DOMAIN}_{self.config[CONF_PORT]}"
                 if unique_id in self._async_current_ids():
                     return self.async_abort(reason="already_configured")
-                # Test the connection
-                device = FlipperIR(self.config[CONF_PORT])
-                await device.open()
-                # read the device info
-                device_info = await device.get_device_info()
-                # Store the device info
-                store = Store(self.hass, DEVICE_INFO_STORAGE_VERSION, f"{DEVICE_INFO_STORAGE}_{self.config[CONF_PORT]}")
-                await store.async_save(device_info)
+                port = self.config[CONF_PORT]
+                cached = _DEVICE_INFO_CACHE.get(port)
+                if cached is not None and time.monotonic() - cached[0] < _DEVICE_INFO_CACHE_TTL:
+                    device_info = cached[1]
+                else:
+                    # Test the connection, reusing the device from a previous attempt
+                    if self._device is not None and self._device.port != port:
+                        self._device.close()
+                        self._device = None
+                    if self._device is None:
+                        self._device = FlipperIR(port)
+                    await self._device.open()
+                    # read the device info
+                    device_info = await self._device.get_device_info()
+                    _DEVICE_INFO_CACHE[port] = (time.monotonic(), device_info)
+                # Store the device info (skip the write if it's unchanged)
+                store = Store(self.hass, DEVICE_INFO_STORAGE_VERSION, f"{DEVICE_INFO_STORAGE}_{port}")
+                if await store.async_load() != device_info:
+                    await store.async_save(device_info)
                 await self.async_set_unique_id(unique_id)
+                self._close_device()
                 return self.async_create_entry(title=self.config[CONF_NAME], data=self.config)
             except OSError as e:
                 if e.errno == 1 or e.errno == 13:
@@ -81,9 +108,6 @@ class FlipperZeroRCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception as e:
                 errors["base"] = "unkown"
                 _LOGGER.error("Unknown error: %s", e, exc_info=True)
-            finally:
-                if device is not None:
-                    device.close()
         schema = vol.Schema(
             {
                 vol.Required(CONF_PORT, default=self.config[CONF_PORT]): cv.string,
@@ -102,7 +126,16 @@ class FlipperZeroRCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             data_schema=schema
         )
-        
+
+    def _close_device(self):
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+
+    def async_remove(self):
+        """Release the test connection when the flow is finished or aborted."""
+        self._close_device()
+
     async def async_step_port_auto_detected(self, user_input=None):
         """Handle the port step."""
         return await self.async_step_port(user_input)
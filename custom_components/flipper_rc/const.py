@@ -10,6 +10,7 @@ DEFAULT_PORT_WINDOWS = "COM1"
 
 CODE_STORAGE_VERSION = 1
 CODE_STORAGE_CODES = f"{DOMAIN}_codes"
+CODE_STORAGE_SAVE_DELAY = 5
 
 DEVICE_INFO_STORAGE_VERSION = 1
 DEVICE_INFO_STORAGE = f"{DOMAIN}_device_info"
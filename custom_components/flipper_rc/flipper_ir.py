@@ -3,12 +3,17 @@ import asyncio
 import serial_asyncio_fast as serial_asyncio
 import logging
 import time
+import functools
+import numpy as np
 from collections import deque
 from posixpath import normpath
 import re
 
 _LOGGER = logging.getLogger(__name__)
 
+# "key: value" lines of 'info device' output, skipping the echoed prompt
+_INFO_RE = re.compile(r'^(?!>: )([^:]+):\s*(.*)$')
+
 
 def _is_supported_subghz_path(path):
     return isinstance(path, str) and path.startswith("/ext/")
@@ -21,7 +26,18 @@ def _has_forbidden_subghz_path_chars(path):
 def _is_sendable_subghz_path(path):
     return _is_supported_subghz_path(path) and not _has_forbidden_subghz_path_chars(path)
 
+
+@functools.lru_cache(maxsize=16)
+def _tx_prefix(frequency, duty_cycle):
+    # The defaults (38000, 50) dominate, so this is usually a dict hit
+    return f"ir tx RAW F:{frequency} DC:{duty_cycle} "
+
 class FlipperIR:
+    # Pre-encoded constant CLI commands - no per-call str building/encoding
+    _CMD_IR_RX_RAW = b'ir rx raw\r\n'
+    _CMD_INFO_DEVICE = b'info device\r\n'
+    _CMD_UPTIME = b'uptime\r\n'
+
     def __init__(self, port, default_timeout=10):
         """
         Create a FlipperIR object.
@@ -37,8 +53,13 @@ class FlipperIR:
         self._protocol = None
         self._lock = asyncio.Lock()
         self._on_connection_lost = None
+        self._device_info_cache = None
 
-    def __del__(self):
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
         self.close()
 
     async def open(self):
@@ -57,14 +78,11 @@ class FlipperIR:
             # Waiting for connection
             # Timeout - 3 seconds
             _LOGGER.debug(f"Connecting to Flipper Zero on {self.port}...")
-            start_time = time.time()
-            while not self._protocol.connected:
-                await asyncio.sleep(0.1)
-                if self._protocol.connected:
-                    break
-                if time.time() - start_time > 3:
-                    self.close()
-                    raise TimeoutError("Timeout while waiting for Flipper Zero to connect")
+            try:
+                await asyncio.wait_for(self._protocol.connected_future, timeout=3)
+            except asyncio.TimeoutError as e:
+                self.close()
+                raise TimeoutError("Timeout while waiting for Flipper Zero to connect") from e
             _LOGGER.debug(f"Serial port {self.port} opened")
             try:
                 await self._protocol.wait_for_prompt()
@@ -141,36 +159,43 @@ class FlipperIR:
 
     def _send_ctrl_c(self):
         if self._transport:
+            self._protocol.consume_prompt()
             self._transport.write(b'\x03')
 
-    async def command(self, cmd, timeout=None):
+    async def command(self, cmd, timeout=None, tail=None):
         """
         Send a command to Flipper Zero and wait for the response.
 
         Args:
-            cmd (str): Command to send.
+            cmd (str or bytes): Command to send. bytes are assumed to be a
+                                pre-encoded, already terminated constant.
             timeout (int or float, optional): Timeout for waiting for response in seconds.
                                                If not specified, uses default_timeout.
+            tail (int, optional): If set, return only the last `tail` response lines.
 
         Returns:
-            list: List of lines received from Flipper Zero.            
-        """
-        if not isinstance(cmd, str):
-            raise ValueError("CLI command must be a string")
-        if "\n" in cmd or "\r" in cmd or "\x00" in cmd:
-            raise ValueError("CLI command contains forbidden control characters")
-
-        _LOGGER.debug(f"Sending command: {cmd.strip()}")
+            list: List of lines received from Flipper Zero.
+        """
+        if isinstance(cmd, bytes):
+            payload = cmd
+        else:
+            if not isinstance(cmd, str):
+                raise ValueError("CLI command must be a string")
+            if "\n" in cmd or "\r" in cmd or "\x00" in cmd:
+                raise ValueError("CLI command contains forbidden control characters")
+            payload = (cmd.strip() + "\r\n").encode()
+
+        _LOGGER.debug("Sending command: %s", payload)
         await self.ensure_open()
 
         async with self._lock:
             if timeout is None:
                 timeout = self.default_timeout
             await self._protocol.wait_for_prompt()
-            self._transport.write((cmd.strip() + "\r\n").encode())
-            await asyncio.sleep(0.1)
+            self._protocol.consume_prompt()
+            self._transport.write(payload)
             try:
-                lines = await self._protocol.wait_for_prompt(timeout=timeout)
+                lines = await self._protocol.collect_until_prompt(timeout=timeout, tail=tail)
             except asyncio.TimeoutError as e:
                 raise TimeoutError("Timeout reached while waiting for Flipper Zero response") from e
             except asyncio.CancelledError:
@@ -195,17 +220,16 @@ class FlipperIR:
             if timeout is None:
                 timeout = self.default_timeout
             await self._protocol.wait_for_prompt()
-            cmd = b'ir rx raw\r\n'
-            self._transport.write(cmd)
-            await asyncio.sleep(0.1)
-            start_time = time.time()
+            self._protocol.consume_prompt()
+            self._transport.write(self._CMD_IR_RX_RAW)
+            start_time = time.monotonic()
             sample_pending = False
 
             while True:
                 try:
                     line = await self._protocol.readline(timeout=timeout)
                 except asyncio.TimeoutError:
-                    if time.time() - start_time > timeout:
+                    if time.monotonic() - start_time > timeout:
                         self._send_ctrl_c()
                         await self._protocol.wait_for_prompt()
                         raise TimeoutError("Timeout reached while waiting for IR signal")
@@ -217,7 +241,8 @@ class FlipperIR:
                     sample_pending = True
                     continue
                 if sample_pending:
-                    samples = [int(x) for x in line.split()]
+                    # Parse the whole sample line in one C-level call
+                    samples = np.fromstring(line, dtype=np.int32, sep=' ').tolist()
                     self._send_ctrl_c()
                     await self._protocol.wait_for_prompt()
                     return samples
@@ -231,11 +256,43 @@ class FlipperIR:
             duty_cycle (int): Duty cycle in % (e.g., 33).
             samples (list): List of pulse and space lengths in microseconds.
         """
-        samples_str = ' '.join(str(x) for x in samples)
-        cmd = f"ir tx RAW F:{frequency} DC:{duty_cycle} {samples_str}"        
-        lines = await self.command(cmd)
+        cmd = _tx_prefix(frequency, duty_cycle) + ' '.join(map(str, samples))
+        lines = await self.command(cmd, tail=2)
         self._validate_cli_response(lines, [">: ir tx RAW", ">: ir tx raw"], "ir tx")
 
+    async def send_ir_batch(self, frames, frequency=38000, duty_cycle=50):
+        """
+        Send several IR signals back-to-back under one lock acquisition.
+
+        After each response the CLI is already at its prompt, so the next
+        frame is written immediately - one prompt wait per frame instead of
+        the two that per-call send_ir round-trips would pay.
+
+        Args:
+            frames (list): List of sample lists (pulse and space lengths in microseconds).
+            frequency (int): Frequency in Hz.
+            duty_cycle (int): Duty cycle in % (e.g., 33).
+        """
+        if not frames:
+            return
+        prefix = _tx_prefix(frequency, duty_cycle)
+        await self.ensure_open()
+
+        async with self._lock:
+            await self._protocol.wait_for_prompt()
+            for samples in frames:
+                cmd = prefix + ' '.join(map(str, samples))
+                self._protocol.consume_prompt()
+                self._transport.write((cmd + "\r\n").encode())
+                try:
+                    lines = await self._protocol.collect_until_prompt(timeout=self.default_timeout, tail=2)
+                except asyncio.TimeoutError as e:
+                    raise TimeoutError("Timeout reached while waiting for Flipper Zero response") from e
+                except asyncio.CancelledError:
+                    self.close()
+                    raise
+                self._validate_cli_response(lines, [">: ir tx RAW", ">: ir tx raw"], "ir tx")
+
     async def send_subghz(self, key, frequency, te=350, repeat=1, antenna=0):
         """Send Sub-GHz key with Flipper CLI subghz tx command."""
         if not (0 <= int(key) <= 0xFFFFFF):
@@ -367,23 +424,31 @@ class FlipperIR:
 
         return sorted(set(discovered))
     
-    async def get_device_info(self):
+    def preload_device_info(self, info):
+        """
+        Seed the device info cache (e.g. from persisted storage) so the
+        first non-forced get_device_info() call returns without a serial round-trip.
+        """
+        if info:
+            self._device_info_cache = info
+
+    async def get_device_info(self, force=False):
         """
         Get device information from Flipper Zero.
 
+        Args:
+            force (bool, optional): Bypass the cached result and query the device.
+
         Returns:
             dict: Device information as a dictionary.
         """
+        if not force and self._device_info_cache is not None:
+            return self._device_info_cache
         _LOGGER.debug("Getting device info")
-        lines = await self.command("info device")
-        info = {}
-        for line in lines:
-            if line.startswith(">: "):
-                continue
-            if ':' in line:
-                key, value = line.split(':', 1)
-                info[key.strip()] = value.strip()
+        lines = await self.command(self._CMD_INFO_DEVICE)
+        info = {m.group(1).strip(): m.group(2).strip() for line in lines if (m := _INFO_RE.match(line))}
         _LOGGER.debug(f"Received info: {info}")
+        self._device_info_cache = info
         return info
 
     async def get_uptime(self):
@@ -395,17 +460,23 @@ class FlipperIR:
         """
         _LOGGER.debug("Getting uptime")
         await self.ensure_open()
-        lines = await self.command("uptime")
+        lines = await self.command(self._CMD_UPTIME)
         uptime = lines[-1].split(' ', 1)[1].strip()
         _LOGGER.debug(f"Received uptime: {uptime}")
         return uptime        
 
 class FlipperProtocol(asyncio.Protocol):
     def __init__(self):
-        self.buffer = b''
-        self.lines = []
+        self.buffer = bytearray()
+        self.lines = deque()
         self._loop = asyncio.get_running_loop()
-        self._line_futures = []
+        self._line_futures = deque()
+        self._prompt_future = None
+        # True while a received prompt has not been claimed by a writer yet.
+        # The prompt bytes stay in the buffer (the command echo is appended
+        # to them), so presence can't be derived from the buffer tail alone.
+        self._prompt_pending = False
+        self.connected_future = self._loop.create_future()
         self._on_connection_lost = None
         self._connected = False
         self._readline_lock = asyncio.Lock()
@@ -419,18 +490,24 @@ class FlipperProtocol(asyncio.Protocol):
 
     def connection_made(self, transport):
         self._connected = True
+        if not self.connected_future.done():
+            self.connected_future.set_result(None)
 
     def data_received(self, data):
         self.buffer += data
-        while b'\n' in self.buffer:
-            line, self.buffer = self.buffer.split(b'\n', 1)
-            line_str = line.strip().decode(errors="ignore")
-            self.lines.append(line_str)
-            if self._line_futures:
-                future = self._line_futures.pop(0)
+        if b'\n' in self.buffer:
+            # Split the whole buffer once instead of re-scanning it per line
+            *complete, self.buffer = self.buffer.split(b'\n')
+            self.lines.extend(line.strip().decode(errors="ignore") for line in complete)
+            while self._line_futures and self.lines:
+                future = self._line_futures.popleft()
                 if not future.done():
-                    future.set_result(self.lines.pop(0))
-    
+                    future.set_result(self.lines.popleft())
+        if self.buffer.endswith(b'>: '):
+            self._prompt_pending = True
+            if self._prompt_future and not self._prompt_future.done():
+                self._prompt_future.set_result(None)
+
     def set_on_connection_lost(self, callback):
         """
         Set a callback to be called when the connection is lost.
@@ -444,7 +521,11 @@ class FlipperProtocol(asyncio.Protocol):
             if not future.done():
                 future.set_exception(ConnectionError("Serial connection lost"))
         self._line_futures.clear()
-        self.buffer = b''
+        if self._prompt_future and not self._prompt_future.done():
+            self._prompt_future.set_exception(ConnectionError("Serial connection lost"))
+        self._prompt_future = None
+        self._prompt_pending = False
+        self.buffer.clear()
         self.lines.clear()
         if self._on_connection_lost:
             self._on_connection_lost()
@@ -461,41 +542,62 @@ class FlipperProtocol(asyncio.Protocol):
         async with self._readline_lock:
             # Если уже есть готовая строка — сразу отдаём
             if self.lines:
-                return self.lines.pop(0)
+                return self.lines.popleft()
             # Ждём!
             future = self._loop.create_future()
             self._line_futures.append(future)
+            # A plain timer handle is cheaper than an asyncio.wait_for wrapper
+            # per line, which matters for the per-line RAW readout loop
+            handle = self._loop.call_later(timeout, self._expire_line_future, future)
             try:
-                return await asyncio.wait_for(future, timeout=timeout)
-            except asyncio.TimeoutError as e:
-                # Если таймаут, то надо убрать future из списка ожидания
-                if not future.done():
-                    self._line_futures.remove(future)
-                raise TimeoutError("Timeout while waiting for Flipper Zero response") from e
-            except asyncio.CancelledError:
-                raise
- 
-    async def wait_for_prompt(self, timeout=3):
+                return await future
+            finally:
+                handle.cancel()
+
+    def _expire_line_future(self, future):
+        # Таймаут: убираем future из списка ожидания и будим читателя
+        if not future.done():
+            try:
+                self._line_futures.remove(future)
+            except ValueError:
+                pass
+            future.set_exception(TimeoutError("Timeout while waiting for Flipper Zero response"))
+
+    async def collect_until_prompt(self, timeout=3, tail=None):
         """
-        Wait for the Flipper Zero prompt to appear.
+        Collect response lines until the Flipper Zero prompt appears.
         Args:
             timeout (int or float, optional): Timeout for waiting for the prompt in seconds, default is 3.
+            tail (int, optional): If set, keep only the last `tail` lines received before the prompt.
         Returns:
             list: List of lines received before the prompt.
         """
 
-        plines = []
-        start_time = time.time()
-        while self.lines_available or not self.has_prompt:
-            while self.lines_available > 0:
-                line = await self.readline(timeout=timeout)
-                plines.append(line)
-            if self.has_prompt:
-                break
-            await asyncio.sleep(0.1)
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Timeout while waiting for Flipper Zero prompt")
-        return plines
+        # maxlen=None keeps everything; a bounded deque discards old lines as they arrive
+        plines = deque(maxlen=tail)
+        # Drain already received lines without awaiting each one
+        while self.lines:
+            plines.append(self.lines.popleft())
+        if not self.has_prompt:
+            # No prompt yet - wait for data_received to signal it
+            self._prompt_future = self._loop.create_future()
+            try:
+                await asyncio.wait_for(self._prompt_future, timeout=timeout)
+            except asyncio.TimeoutError as e:
+                raise TimeoutError("Timeout while waiting for Flipper Zero prompt") from e
+            finally:
+                self._prompt_future = None
+            # Collect lines that arrived together with the prompt
+            while self.lines:
+                plines.append(self.lines.popleft())
+        return list(plines)
+
+    async def wait_for_prompt(self, timeout=3, tail=None):
+        """
+        Alias of collect_until_prompt, kept for readability at call
+        sites that only care about the prompt, not the lines.
+        """
+        return await self.collect_until_prompt(timeout=timeout, tail=tail)
 
     # def reset(self):
     #     self.buffer = b''
@@ -517,11 +619,22 @@ class FlipperProtocol(asyncio.Protocol):
     @property
     def has_prompt(self):
         """
-        Check if the prompt is present in the buffer.
+        Check if a prompt has been received and not yet consumed by a writer.
         Returns:
-            bool: True if the prompt is present, False otherwise.
+            bool: True if an unconsumed prompt is pending, False otherwise.
+        """
+        return self._prompt_pending
+
+    def consume_prompt(self):
+        """
+        Claim the pending prompt before writing a command.
+
+        After this, wait_for_prompt/collect_until_prompt only return once the
+        device sends a *new* prompt - without it, the prompt left over from
+        the previous exchange would satisfy the post-write wait immediately,
+        before the device has produced a single byte of the response.
         """
-        return self.buffer.endswith(b'>: ')
+        self._prompt_pending = False
 
 
 # Пример использования:
@@ -3,7 +3,7 @@ import logging
 import asyncio
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
-import time
+from datetime import timedelta
 from .flipper_ir import FlipperIR
 
 from .const import *
@@ -29,6 +29,11 @@ from homeassistant.components.remote import (
     RemoteEntityFeature,
 )
 from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
 from .rc_encoder import rc_auto_encode, rc_auto_decode
 from .parsers import parse_subghz_command, parse_subghz_file_command
@@ -42,6 +47,37 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 _LOGGER = logging.getLogger(__name__)
 
+# Static fragments of the learn-command notification, hoisted so each learn
+# only formats the dynamic values instead of rebuilding the whole text
+_LEARN_EXAMPLE_TEMPLATE = (
+    "<pre>service: remote.send_command\ntarget:\n  entity_id: {entity_id}\ndata:\n  command: {code}</pre>"
+)
+_LEARN_DEVICE_EXAMPLE_TEMPLATE = (
+    "<pre>service: remote.send_command\ntarget:\n  entity_id: {entity_id}\ndata:\n  device: {device}\n  command: {command}</pre>"
+)
+_LEARN_RAW_FALLBACK_TEMPLATE = (
+    "If code above is not working, you can try to use the raw code:\n{example}"
+    'But <a href="https://github.com/ClusterM/flipper_rc/issues">create a bug report</a> in such case, please.'
+)
+_LEARN_USAGE_DEVICE = (
+    "\n\nNow you can use this device identifier and command name in your automations and scripts "
+    "with the 'remote.send_command' service. Example:"
+)
+_LEARN_USAGE_DIRECT = (
+    "\n\nOr you can use the button code directly in your automations and scripts "
+    "with the 'remote.send_command' service. Example:"
+)
+_LEARN_USAGE_CODE = (
+    "\n\nNow you can use this code in your automations and scripts "
+    "with the 'remote.send_command' service. Example:"
+)
+# How long a learn may run before the "press the button" prompt is shown
+_LEARN_PROMPT_DELAY = 0.5
+_LEARN_RAW_WARNING = (
+    "\r\n\r\n<b>Warning</b>: this command is learned in raw format, e.g. it can't be decoded using known "
+    "protocol decoders. It's better to try to learn the command again but it's ok if you keep seeing this message."
+)
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the Flipper Zero Remote Control entry."""
@@ -63,7 +99,13 @@ async def async_setup_platform(hass, config, async_add_entities, entry_id=None):
 
     _LOGGER.debug("Setting up Flipper Zero Remote Control: name=%s, port=%s", name, port)
 
-    remote = FlipperRCEntity(name, port, device_info_storage, device_info, codes_storage, codes, entry_id)
+    device = FlipperIR(port)
+    device.preload_device_info(device_info)
+    coordinator = FlipperRCCoordinator(hass, device)
+    # First contact with the device; failure just leaves the entity unavailable
+    await coordinator.async_refresh()
+
+    remote = FlipperRCEntity(coordinator, name, port, device_info_storage, device_info, codes_storage, codes, entry_id)
 
     if entry_id is not None:
         hass.data.setdefault(DOMAIN, {}).setdefault("remote_entities", {})[entry_id] = remote
@@ -71,19 +113,75 @@ async def async_setup_platform(hass, config, async_add_entities, entry_id=None):
     async_add_entities([remote])
 
 
-class FlipperRCEntity(RemoteEntity):
-    def __init__(self, name, port, device_info_storage, device_info, codes_storage, codes, entry_id=None):
-        self._name = name
+POLL_INTERVAL_MIN = 30
+POLL_INTERVAL_MAX = 600
+
+
+class FlipperRCCoordinator(DataUpdateCoordinator):
+    """Coordinator that polls the Flipper device info, backing off while it's unchanged."""
+
+    def __init__(self, hass, device):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=POLL_INTERVAL_MIN),
+            # Only notify listeners when the fetched dict actually differs
+            always_update=False,
+        )
+        self.device = device
+        self._poll_seconds = POLL_INTERVAL_MIN
+
+    def reset_poll_interval(self):
+        """Return to fast polling, e.g. after a change or user interaction."""
+        if self._poll_seconds != POLL_INTERVAL_MIN:
+            self._poll_seconds = POLL_INTERVAL_MIN
+            self.update_interval = timedelta(seconds=self._poll_seconds)
+
+    async def _async_update_data(self):
+        try:
+            info = await self.device.get_device_info(force=True)
+        except (TimeoutError, OSError, ValueError) as e:
+            # Poll fast again so recovery is noticed quickly
+            self.reset_poll_interval()
+            raise UpdateFailed(f"Failed to update Flipper device info: {e}") from e
+        # Device info almost never changes after boot - double the interval
+        # while it stays the same, snap back to fast polling when it moves
+        if self.data == info:
+            self._poll_seconds = min(self._poll_seconds * 2, POLL_INTERVAL_MAX)
+        else:
+            self._poll_seconds = POLL_INTERVAL_MIN
+        self.update_interval = timedelta(seconds=self._poll_seconds)
+        return info
+
+
+class FlipperRCEntity(CoordinatorEntity, RemoteEntity):
+    # HA entity base classes aren't slotted, so instances keep a __dict__
+    # for the _attr_* fields, but slotting our own fields at least keeps
+    # them out of it and makes their loads a fixed-offset access
+    __slots__ = (
+        '_port', '_entry_id', '_device_info_storage', '_device_info',
+        '_codes_storage', '_codes', '_available', '_device', '_cached_device_info',
+    )
+
+    def __init__(self, coordinator, name, port, device_info_storage, device_info, codes_storage, codes, entry_id=None):
+        super().__init__(coordinator)
+        # Immutable attributes - plain _attr_* assignments are cheaper than
+        # the @property calls HA would otherwise make on every read
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}_{port}"
+        self._attr_supported_features = RemoteEntityFeature.LEARN_COMMAND | RemoteEntityFeature.DELETE_COMMAND
         self._port = port
         self._entry_id = entry_id
         self._device_info_storage = device_info_storage
         self._device_info = device_info
-        self._last_device_info_update = 0
         self._codes_storage = codes_storage
         self._codes = codes
         self._available = False
-        self._device = FlipperIR(self._port)
+        self._device = coordinator.device
         self._device.set_on_connection_lost(self._on_connection_lost)
+        # Rebuilt only when the underlying device info dict changes
+        self._cached_device_info = self._build_device_info()
 
     def _on_connection_lost(self):
         _LOGGER.warning("Connection lost to Flipper device %s", self._port)
@@ -98,26 +196,13 @@ class FlipperRCEntity(RemoteEntity):
     def state(self):
         return 'online' if self._available else 'offline'
 
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return f"{DOMAIN}_{self._port}"
-
     @property
     def port(self):
         return self._port
 
-    @property
-    def should_poll(self):
-        return True
-
-    @property
-    def device_info(self):
+    def _build_device_info(self):
         return DeviceInfo(
-            name=self._name,
+            name=self._attr_name,
             manufacturer="Flipper Devices Inc.",
             identifiers={(DOMAIN, self._port)},
             connections={(DOMAIN, self._device_info.get("hardware.name", ""))},
@@ -126,18 +211,19 @@ class FlipperRCEntity(RemoteEntity):
             hw_version=self._device_info.get("hardware.ver", ""),
             sw_version=self._device_info.get("firmware.version", ""),
         )
+
+    @property
+    def device_info(self):
+        return self._cached_device_info
     
     @property
     def extra_state_attributes(self):
         return self._device_info
 
-    @property
-    def supported_features(self):
-        return RemoteEntityFeature.LEARN_COMMAND | RemoteEntityFeature.DELETE_COMMAND
-
     async def async_added_to_hass(self):
-        await self.async_update()
-        self.schedule_update_ha_state()
+        await super().async_added_to_hass()
+        # Pick up the result of the setup-time refresh
+        self._handle_coordinator_update()
 
     async def async_will_remove_from_hass(self):
         _LOGGER.debug("Removing device from Home Assistant...")
@@ -149,23 +235,21 @@ class FlipperRCEntity(RemoteEntity):
             self._device.close()
             _LOGGER.debug("Device deinitialized.")
 
-    async def async_update(self):
-        """Update the device."""
-        # Limit the update frequency to every 30 seconds
-        if time.time() - self._last_device_info_update < 30:
-            return
-        self._last_device_info_update = time.time()
-        try:
-            device_info = await self._device.get_device_info()
+    def _handle_coordinator_update(self):
+        """Handle a finished coordinator poll."""
+        changed = self._available != self.coordinator.last_update_success
+        self._available = self.coordinator.last_update_success
+        if self._available:
+            device_info = self.coordinator.data
             # compare with the previous device info
-            if self._device_info != device_info:
+            if device_info is not None and self._device_info != device_info:
                 _LOGGER.info("Device info changed: %s", device_info)
                 self._device_info = device_info
-                await self._device_info_storage.async_save(self._device_info)
-            self._available = True
-        except Exception as e:
-            _LOGGER.error("Failed to update Flipper device info, exception %s: %s", type(e), e, exc_info=True)
-            self._available = False
+                self._cached_device_info = self._build_device_info()
+                self.hass.async_create_task(self._device_info_storage.async_save(device_info))
+                changed = True
+        if changed:
+            self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
@@ -185,29 +269,51 @@ class FlipperRCEntity(RemoteEntity):
 
     async def async_send_command(self, command, **kwargs):
         """Send a list of commands to a device."""
-        device = kwargs.get(ATTR_DEVICE, None)
+        device = kwargs.get(ATTR_DEVICE)
         repeat = kwargs.get(ATTR_NUM_REPEATS, 1)
         repeat_delay = kwargs.get(ATTR_DELAY_SECS, 0)
         hold = kwargs.get(ATTR_HOLD_SECS, 0)
         
         if hold != 0:
             raise NotImplementedError("Hold time is not supported.")
-        
+
+        if not command:
+            # Nothing to send - don't pay for the loop or touch availability
+            return
+        if repeat < 1:
+            raise ValueError("Number of repeats must be at least 1.")
+
         try:
+            # Consecutive IR frames are collected here and flushed in one
+            # locked batch instead of a serial round-trip per command
+            ir_batch = []
+
+            async def _flush_ir():
+                if ir_batch:
+                    await self._device.send_ir_batch(ir_batch)
+                    ir_batch.clear()
+
+            # Pulses already encoded during this service call, keyed by code
+            encoded = {}
+            # Codes don't change mid-send, so resolve the device dict once
+            device_codes = None
+            if device:
+                device_codes = self._codes.get(device)
+                if device_codes is None:
+                    raise KeyError(f"Device '{device}' not found in the codes storage.")
             for n in range(repeat):
                 for cmd in command:
-                    if device:
-                        if not device in self._codes:
-                            raise KeyError(f"Device '{device}' not found in the codes storage.")
-                        if not cmd in self._codes[device]:
+                    if device_codes is not None:
+                        code = device_codes.get(cmd)
+                        if code is None:
                             raise KeyError(f"Command '{cmd}' not found in the codes storage for device '{device}'.")
-                        code = self._codes[device][cmd]
                         _LOGGER.debug("Sending command '%s' for device '%s', code: %s", cmd, device, code)
                     else:
                         code = cmd
                         _LOGGER.debug("Sending command, code: '%s'", code)
 
                     if isinstance(code, str) and code.startswith("subghz-file:"):
+                        await _flush_ir()
                         tx = parse_subghz_file_command(code)
                         _LOGGER.debug("Sub-GHz file command parsed: %s", tx)
                         await self._device.send_subghz_from_file(
@@ -216,6 +322,7 @@ class FlipperRCEntity(RemoteEntity):
                             antenna=tx["antenna"],
                         )
                     elif isinstance(code, str) and code.startswith("subghz:"):
+                        await _flush_ir()
                         tx = parse_subghz_command(code)
                         _LOGGER.debug("Sub-GHz command parsed: %s", tx)
                         await self._device.send_subghz(
@@ -226,24 +333,36 @@ class FlipperRCEntity(RemoteEntity):
                             antenna=tx["antenna"],
                         )
                     else:
-                        pulses = rc_auto_encode(code)
-                        _LOGGER.debug("Command pulses: %s", pulses)
-                        await self._device.send_ir(pulses)
+                        pulses = encoded.get(code)
+                        if pulses is None:
+                            # Encode off the event loop - raw pulse lists can be long
+                            encoded[code] = pulses = await asyncio.to_thread(rc_auto_encode, code)
+                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                            # Don't repr a thousand-int raw pulse list in full
+                            _LOGGER.debug("Command pulses: %s%s", pulses[:10], "..." if len(pulses) > 10 else "")
+                        ir_batch.append(pulses)
                     if n < repeat - 1 and repeat_delay > 0:
+                        await _flush_ir()
                         await asyncio.sleep(repeat_delay)
+            await _flush_ir()
+            self.coordinator.reset_poll_interval()
             if not self._available:
                 self._available = True
                 self.schedule_update_ha_state()
+        except (TimeoutError, OSError, ValueError, KeyError) as e:
+            # Expected transient/user errors - skip the costly traceback formatting
+            _LOGGER.error("Failed to send command, exception %s: %s", type(e), e)
+            raise HomeAssistantError(str(e))
         except Exception as e:
             _LOGGER.error("Failed to send command, exception %s: %s", type(e), e, exc_info=True)
             raise HomeAssistantError(str(e))
 
     async def async_learn_command(self, **kwargs):
         """Learn a command to a device, or just show the received command code."""
-        device = kwargs.get(ATTR_DEVICE, None)
+        device = kwargs.get(ATTR_DEVICE)
         commands = kwargs.get(ATTR_COMMAND, [])
         command_type = kwargs.get(ATTR_COMMAND_TYPE, "ir")
-        alternative = kwargs.get(ATTR_ALTERNATIVE, None)
+        alternative = kwargs.get(ATTR_ALTERNATIVE)
         timeout = kwargs.get(ATTR_TIMEOUT, 10)
 
         if len(commands) != 1:
@@ -261,48 +380,65 @@ class FlipperRCEntity(RemoteEntity):
                         "Use remote.send_command with a subghz:... code string."
                     )
                 raise NotImplementedError(f'Unknown command type "{command_type}", only "ir" is supported.')
-            if alternative != None: raise ValueError('"Alternative" option is not supported.')
+            if alternative is not None: raise ValueError('"Alternative" option is not supported.')
             if self._device.busy:
                 raise HomeAssistantError("Device is busy, please wait and try again.")
-            async_create(
-                self.hass,
-                f'Press the "<b>{command}</b>" button.',
-                title=NOTIFICATION_TITLE,
-                notification_id=notification_id,
+            # Delay the prompt so a quick button press goes straight to the
+            # result instead of flashing a notification that's immediately
+            # replaced - one state event instead of two for responsive users
+            prompt_handle = self.hass.loop.call_later(
+                _LEARN_PROMPT_DELAY,
+                lambda: async_create(
+                    self.hass,
+                    f'Press the "<b>{command}</b>" button.',
+                    title=NOTIFICATION_TITLE,
+                    notification_id=notification_id,
+                ),
             )
-            
-            _LOGGER.debug(f"Waiting for button press...")
-            pulses = await self._device.receive_ir(timeout)
-            _LOGGER.debug("Button pressed: %s", pulses)
+
+            _LOGGER.debug("Waiting for button press...")
+            try:
+                pulses = await self._device.receive_ir(timeout)
+            finally:
+                prompt_handle.cancel()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Button pressed: %s%s", pulses[:10], "..." if len(pulses) > 10 else "")
             if len(pulses) < 4:
                 raise ValueError("This IR code is too short and seems to be invalid. Please try to learn the command again.")
-            decoded = rc_auto_decode(pulses)
+            decoded = await asyncio.to_thread(rc_auto_decode, pulses)
             _LOGGER.debug("Button decoded: %s", decoded)
-            decoded_raw = rc_auto_decode(pulses, force_raw=True)
+            decoded_raw = await asyncio.to_thread(rc_auto_decode, pulses, force_raw=True)
 
-            direct_code_example = f'<pre>service: remote.send_command\ntarget:\n  entity_id: {self.entity_id}\ndata:\n  command: {decoded}</pre>'
-            direct_code_example_raw = f'If code above is not working, you can try to use the raw code:\n<pre>service: remote.send_command\ntarget:\n  entity_id: {self.entity_id}\ndata:\n  command: {decoded_raw}</pre>But <a href="https://github.com/ClusterM/flipper_rc/issues">create a bug report</a> in such case, please.'
-            
+            is_raw = decoded.startswith("raw:")
+            direct_code_example = _LEARN_EXAMPLE_TEMPLATE.format_map({"entity_id": self.entity_id, "code": decoded})
+
+            # Build the notification from parts and join once instead of
+            # chaining + on progressively longer strings
+            parts = []
             if device:
-                self._codes.setdefault(device, {}).update({command: decoded})
-                await self._codes_storage.async_save(self._codes)
+                self._codes.setdefault(device, {})[command] = decoded
+                # Debounced write - rapid learns coalesce into one disk save
+                self._codes_storage.async_delay_save(lambda: self._codes, CODE_STORAGE_SAVE_DELAY)
                 self.schedule_update_ha_state() # Update device attributes
-                msg = f'Successfully learned command "<b>{command}</b>" for device "<b>{device}</b>", code:\r\n<pre>{decoded}</pre>' + \
-                    (f"Raw code:<pre>{decoded_raw}</pre>" if not decoded.startswith("raw:") else "") + \
-                    "\n\nNow you can use this device identifier and command name in your automations and scripts with the 'remote.send_command' service. Example:" + \
-                    f'<pre>service: remote.send_command\ntarget:\n  entity_id: {self.entity_id}\ndata:\n  device: {device}\n  command: {command}</pre>' + \
-                    "\n\nOr you can use the button code directly in your automations and scripts with the 'remote.send_command' service. Example:" + \
-                    direct_code_example + \
-                    (f"\n\n{direct_code_example_raw}" if not decoded.startswith("raw:") else "")
+                parts.append(f'Successfully learned command "<b>{command}</b>" for device "<b>{device}</b>", code:\r\n<pre>{decoded}</pre>')
+            else:
+                parts.append(f'Successfully received command "{command}", code:\r\n<pre>{decoded}</pre>')
+            if not is_raw:
+                parts.append(f"Raw code:<pre>{decoded_raw}</pre>")
+            if device:
+                parts.append(_LEARN_USAGE_DEVICE)
+                parts.append(_LEARN_DEVICE_EXAMPLE_TEMPLATE.format_map(
+                    {"entity_id": self.entity_id, "device": device, "command": command}))
+                parts.append(_LEARN_USAGE_DIRECT)
             else:
-                msg = f'Successfully received command "{command}", code:\r\n<pre>{decoded}</pre>' + \
-                    (f"Raw code:<pre>{decoded_raw}</pre>" if not decoded.startswith("raw:") else "") + \
-                    "\n\nNow you can use this code in your automations and scripts with the 'remote.send_command' service. Example:" + \
-                    direct_code_example + \
-                    (f"\n\n{direct_code_example_raw}" if not decoded.startswith("raw:") else "")
-                
-            if decoded.startswith("raw:"):
-                msg += "\r\n\r\n<b>Warning</b>: this command is learned in raw format, e.g. it can't be decoded using known protocol decoders. It's better to try to learn the command again but it's ok if you keep seeing this message."
+                parts.append(_LEARN_USAGE_CODE)
+            parts.append(direct_code_example)
+            if not is_raw:
+                raw_example = _LEARN_EXAMPLE_TEMPLATE.format_map({"entity_id": self.entity_id, "code": decoded_raw})
+                parts.append("\n\n" + _LEARN_RAW_FALLBACK_TEMPLATE.format_map({"example": raw_example}))
+            else:
+                parts.append(_LEARN_RAW_WARNING)
+            msg = "".join(parts)
 
             async_create(
                 self.hass,
@@ -311,45 +447,55 @@ class FlipperRCEntity(RemoteEntity):
                 notification_id=notification_id,
             )
             
+            self.coordinator.reset_poll_interval()
             if not self._available:
                 self._available = True
                 self.schedule_update_ha_state()
+        except (TimeoutError, OSError, ValueError, NotImplementedError, HomeAssistantError) as e:
+            # Expected transient/user errors - skip the costly traceback formatting
+            _LOGGER.error("Failed to learn command, exception %s: %s", type(e), e)
+            self._notify_learn_failed(command, e, notification_id)
+            raise HomeAssistantError(str(e))
         except Exception as e:
             _LOGGER.error("Failed to learn command, exception %s: %s", type(e), e, exc_info=True)
-            async_create(
-                self.hass,
-                f'Cannot learn command "{command}": {e}',
-                title=NOTIFICATION_TITLE,
-                notification_id=notification_id,
-            )
+            self._notify_learn_failed(command, e, notification_id)
             raise HomeAssistantError(str(e))
 
+    def _notify_learn_failed(self, command, error, notification_id):
+        async_create(
+            self.hass,
+            f'Cannot learn command "{command}": {error}',
+            title=NOTIFICATION_TITLE,
+            notification_id=notification_id,
+        )
+
     async def async_delete_command(self, **kwargs):
         """Delete a command from a device."""
-        device = kwargs.get(ATTR_DEVICE, None)
+        device = kwargs.get(ATTR_DEVICE)
         commands = kwargs.get(ATTR_COMMAND, [])
         
         if not device:
             raise HomeAssistantError("You need to specify a device.")
 
-        if not device in self._codes:
+        device_codes = self._codes.get(device)
+        if device_codes is None:
             raise HomeAssistantError(f"Device '{device}' not found in the codes storage.")
 
-        deleted = False
-        for command in commands:
-            if device in self._codes and command in self._codes[device]:
-                del self._codes[device][command]
-                deleted = True
-                async_create(
-                    self.hass,
-                    f'Successfully deleted command "{command}" for device "{device}".',
-                    title=NOTIFICATION_TITLE
-                )
+        # One pop per command, one notification for the whole batch
+        deleted = [command for command in commands if device_codes.pop(command, None) is not None]
         if not deleted:
-            raise HomeAssistantError(f'Command "{command}" for device "{device}" not found.')
+            commands_str = '", "'.join(commands)
+            raise HomeAssistantError(f'Command "{commands_str}" for device "{device}" not found.')
+        deleted_str = '", "'.join(deleted)
+        async_create(
+            self.hass,
+            f'Successfully deleted command "{deleted_str}" for device "{device}".',
+            title=NOTIFICATION_TITLE
+        )
 
         # Remove device if no commands left
-        if device in self._codes and not self._codes[device]:
+        if not device_codes:
             del self._codes[device]
 
-        await self._codes_storage.async_save(self._codes)
+        # Debounced write - deleting several commands causes one disk save
+        self._codes_storage.async_delay_save(lambda: self._codes, CODE_STORAGE_SAVE_DELAY)
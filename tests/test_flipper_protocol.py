@@ -0,0 +1,120 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# flipper_ir imports its serial/numpy dependencies at module level; the tests
+# below only exercise FlipperProtocol and need no hardware.
+pytest.importorskip("serial_asyncio_fast")
+pytest.importorskip("numpy")
+
+_FLIPPER_IR_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "flipper_rc" / "flipper_ir.py"
+_SPEC = importlib.util.spec_from_file_location("flipper_rc_flipper_ir", _FLIPPER_IR_PATH)
+_MODULE = importlib.util.module_from_spec(_SPEC)
+assert _SPEC is not None and _SPEC.loader is not None
+_SPEC.loader.exec_module(_MODULE)
+
+FlipperProtocol = _MODULE.FlipperProtocol
+FlipperIR = _MODULE.FlipperIR
+
+
+class _RecordingTransport:
+    """Fake transport that answers each write with a delayed echo+prompt."""
+
+    def __init__(self, proto, events):
+        self._proto = proto
+        self._events = events
+
+    def write(self, data):
+        self._events.append("write")
+        asyncio.get_running_loop().call_later(0.02, self._respond)
+
+    def _respond(self):
+        self._events.append("prompt")
+        self._proto.data_received(b"ir tx RAW\r\n>: ")
+
+    def close(self):
+        pass
+
+
+def test_consume_prompt_clears_pending_flag():
+    async def scenario():
+        proto = FlipperProtocol()
+        proto.connection_made(None)
+        assert not proto.has_prompt
+        proto.data_received(b">: ")
+        assert proto.has_prompt
+        proto.consume_prompt()
+        assert not proto.has_prompt
+
+    asyncio.run(scenario())
+
+
+def test_collect_waits_for_response_sent_after_write():
+    # Regression: the prompt left over from the previous exchange must not
+    # satisfy the post-write collect before the device has responded.
+    async def scenario():
+        proto = FlipperProtocol()
+        proto.connection_made(None)
+        proto.data_received(b">: ")  # prompt printed on connect
+        loop = asyncio.get_running_loop()
+
+        await proto.wait_for_prompt(timeout=1)
+        proto.consume_prompt()  # the write would happen here
+        loop.call_later(
+            0.05,
+            proto.data_received,
+            b"info device\r\nhardware_model: Flipper\r\n>: ",
+        )
+        return await proto.collect_until_prompt(timeout=1)
+
+    lines = asyncio.run(scenario())
+    assert lines == [">: info device", "hardware_model: Flipper"]
+
+
+def test_back_to_back_exchanges_get_their_own_responses():
+    # There is no pacing sleep between writes anymore; with prompt
+    # consumption each exchange must still receive its own response
+    # instead of the previous one's.
+    async def scenario():
+        proto = FlipperProtocol()
+        proto.connection_made(None)
+        proto.data_received(b">: ")
+        loop = asyncio.get_running_loop()
+
+        results = []
+        for i in range(3):
+            await proto.wait_for_prompt(timeout=1)
+            proto.consume_prompt()
+            loop.call_later(
+                0.02,
+                proto.data_received,
+                f"cmd{i}\r\nresp{i}\r\n>: ".encode(),
+            )
+            results.append(await proto.collect_until_prompt(timeout=1))
+        return results
+
+    results = asyncio.run(scenario())
+    for i, lines in enumerate(results):
+        assert lines == [f">: cmd{i}", f"resp{i}"]
+
+
+def test_send_ir_batch_waits_for_the_prompt_between_frames():
+    # Each frame write must wait for the previous frame's prompt; without
+    # prompt consumption all writes would land back-to-back while the
+    # device is still transmitting.
+    async def scenario():
+        proto = FlipperProtocol()
+        events = []
+        transport = _RecordingTransport(proto, events)
+        proto.connection_made(transport)
+        proto.data_received(b">: ")
+        device = FlipperIR("test-port")
+        device._transport = transport
+        device._protocol = proto
+        await device.send_ir_batch([[100, 200], [100, 200], [100, 200]])
+        return events
+
+    events = asyncio.run(scenario())
+    assert events == ["write", "prompt"] * 3